@@ -5,29 +5,361 @@ MCP Server for DNSimple API Interactions
 Provides tools for domain management, DNS configuration, pricing queries, and domain transfers.
 """
 
-import json
+import asyncio
+import importlib
+import importlib.util
 import os
+import socket
+import sqlite3
+import stat
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
 
+import jsonschema
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent
+from mcp.types import CallToolResult, Tool, TextContent
+
+try:
+    import orjson
+except ImportError:
+    import json
+
+    orjson = None
 
 # DNSimple API configuration
 DNSIMPLE_API_BASE = "https://api.dnsimple.com/v2"
 
+# DNSimple API endpoint templates, filled in with str.format at call sites.
+# Keeping every path here also keeps the cache keys built from them in step.
+API_URLS = {
+    "whoami": f"{DNSIMPLE_API_BASE}/whoami",
+    "accounts": f"{DNSIMPLE_API_BASE}/accounts",
+    "domains": f"{DNSIMPLE_API_BASE}/{{account}}/domains",
+    "registrar_domain": f"{DNSIMPLE_API_BASE}/{{account}}/registrar/domains/{{domain}}",
+    "tld_prices": f"{DNSIMPLE_API_BASE}/{{account}}/registrar/tlds/{{tld}}/prices",
+    "transfers": f"{DNSIMPLE_API_BASE}/{{account}}/registrar/domains/{{domain}}/transfers",
+    "delegation": f"{DNSIMPLE_API_BASE}/{{account}}/registrar/domains/{{domain}}/delegation",
+    "whois_privacy": f"{DNSIMPLE_API_BASE}/{{account}}/registrar/domains/{{domain}}/whois_privacy",
+    "zone_records": f"{DNSIMPLE_API_BASE}/{{account}}/zones/{{domain}}/records",
+    "zone_record": f"{DNSIMPLE_API_BASE}/{{account}}/zones/{{domain}}/records/{{record}}",
+}
+
+# Maximum number of concurrent API requests for per-domain lookups
+MAX_WORKERS = 16
+
+# Maximum number of concurrent page requests when listing paginated resources
+PAGINATION_WORKERS = 8
+
+# Tool results are compact JSON unless DNSIMPLE_MCP_PRETTY=1 is set for debugging
+PRETTY_OUTPUT = os.getenv("DNSIMPLE_MCP_PRETTY") == "1"
+
+# Results with more items than this are always returned as compact JSON
+LARGE_RESULT_SIZE = 500
+
+# Buffer size for JSON-RPC messages read from stdin (bytes). Longer messages
+# are still accepted; they are read in pieces of this size.
+STDIO_LINE_LIMIT = 16 * 1024 * 1024
+
+# Default (connect, read) timeout for every DNSimple API request
+REQUEST_TIMEOUT = (5, 30)
+
+
+# TCP keep-alive timing for pooled connections: first probe after this many
+# idle seconds, then every interval seconds, giving up after count probes.
+# The kernel default idle time (7200s on Linux) is far longer than typical
+# NAT and load balancer idle timeouts, so probes would never be sent.
+TCP_KEEPALIVE_IDLE = 60
+TCP_KEEPALIVE_INTERVAL = 15
+TCP_KEEPALIVE_COUNT = 4
+
+_KEEPALIVE_SOCKET_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+# macOS names the idle option TCP_KEEPALIVE
+_TCP_KEEPIDLE = getattr(socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None))
+if _TCP_KEEPIDLE is not None:
+    _KEEPALIVE_SOCKET_OPTIONS.append(
+        (socket.IPPROTO_TCP, _TCP_KEEPIDLE, TCP_KEEPALIVE_IDLE)
+    )
+if hasattr(socket, "TCP_KEEPINTVL"):
+    _KEEPALIVE_SOCKET_OPTIONS.append(
+        (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, TCP_KEEPALIVE_INTERVAL)
+    )
+if hasattr(socket, "TCP_KEEPCNT"):
+    _KEEPALIVE_SOCKET_OPTIONS.append(
+        (socket.IPPROTO_TCP, socket.TCP_KEEPCNT, TCP_KEEPALIVE_COUNT)
+    )
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets send TCP keep-alive probes."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = (
+            HTTPConnection.default_socket_options + _KEEPALIVE_SOCKET_OPTIONS
+        )
+        super().init_poolmanager(*args, **kwargs)
+
+
+# Shared HTTP session so API calls reuse pooled keep-alive connections
+# instead of opening a new TCP+TLS connection per request. When every pooled
+# connection is busy, callers wait for one to free up rather than opening
+# extra connections that would be discarded after a single request. TCP
+# keep-alive probes after a minute idle keep pooled connections open through
+# middleboxes with idle timeouts, which would otherwise drop them between
+# tool calls and force a fresh TLS handshake.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    _KeepAliveAdapter(
+        pool_connections=1,
+        pool_maxsize=32,
+        pool_block=True,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 502, 503, 504],
+            raise_on_status=False,
+        ),
+    ),
+)
+SESSION.headers.update({"Accept": "application/json"})
+
+# API token currently set in the session's Authorization header
+_SESSION_TOKEN: Optional[str] = None
+
+# How long TLD price tables are reused before being fetched again (seconds)
+TLD_PRICES_TTL = 15 * 60
+
+# Second-level registry suffixes that DNSimple prices as their own TLD
+MULTIPART_TLDS = frozenset(
+    {
+        "co.uk",
+        "me.uk",
+        "org.uk",
+        "ltd.uk",
+        "plc.uk",
+        "com.au",
+        "net.au",
+        "org.au",
+        "co.nz",
+        "net.nz",
+        "org.nz",
+        "com.br",
+        "com.mx",
+        "com.co",
+        "net.co",
+        "nom.co",
+        "co.in",
+        "net.in",
+        "org.in",
+        "com.es",
+        "org.es",
+        "co.za",
+    }
+)
+
+# TLD prices keyed by (account_id, tld), storing (expiry timestamp, prices)
+_TLD_PRICES_CACHE: Dict[Tuple[str, str], Tuple[float, List[Dict[str, Any]]]] = {}
+_TLD_PRICES_LOCK = threading.Lock()
+
+# How long successful reads of frequently re-queried resources are reused (seconds)
+RECENT_READ_TTL = 60
+
+# Maximum number of recent reads kept; the oldest is dropped first
+RECENT_READS_MAXSIZE = 512
+
+# Recent successful GET responses keyed by URL, storing
+# (expiry timestamp, status code, body)
+_RECENT_READS: Dict[str, Tuple[float, int, bytes]] = {}
+_RECENT_READS_LOCK = threading.Lock()
+
+# How long a resolved account ID is reused for the same token (seconds)
+ACCOUNT_ID_TTL = 24 * 60 * 60
+
+# Account IDs keyed by API token, storing (expiry timestamp, account_id)
+_ACCOUNT_ID_CACHE: Dict[str, Tuple[float, str]] = {}
+_ACCOUNT_ID_LOCK = threading.Lock()
+
+# Account lookup endpoint that works for each API token ("whoami" or "accounts")
+_ACCOUNT_LOOKUP_FLOW: Dict[str, str] = {}
+
+# How long a resolved API token is reused before credentials are re-read (seconds)
+TOKEN_TTL = 5 * 60
+
+# Last resolved API token, stored as (expiry timestamp, token)
+_TOKEN_CACHE: Optional[Tuple[float, str]] = None
+
 # Configuration directory (portable, uses user's home directory)
 CONFIG_DIR = Path.home() / ".config" / "dnsimple-mcp"
 CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 ENV_FILE = CONFIG_DIR / ".env"
 
-# Optional: Try to import 1Password credential utility if available
+# On-disk cache for slow-changing registrar data (TLD prices, domain info)
+CACHE_FILE = CONFIG_DIR / "cache.sqlite3"
+CACHE_TTL = 60 * 60
+_CACHE_DB: Optional[sqlite3.Connection] = None
+_CACHE_LOCK = threading.Lock()
+
+# Parsed .env values, stored as (file mtime, values); re-parsed when the file changes
+_ENV_CACHE: Tuple[Optional[float], Dict[str, str]] = (None, {})
+
+# Optional: 1Password credential utility, imported on first use if available
 # This allows the MCP server to work standalone or with 1Password integration
 HAS_CREDENTIALS_MODULE = False
-try:
+_CREDENTIALS_MODULE: Optional[ModuleType] = None
+_CREDENTIALS_PROBED = False
+
+# Initialize MCP server
+app = Server("dnsimple")
+
+
+def _loads(data: bytes) -> Any:
+    """Decode a JSON response body, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# orjson options: datetimes and UUIDs are encoded natively, with naive
+# datetimes treated as UTC and written with a "Z" suffix like DNSimple's own
+# timestamps. default=str remains only as a fallback for unknown types.
+if orjson is not None:
+    _ORJSON_COMPACT = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+    _ORJSON_PRETTY = _ORJSON_COMPACT | orjson.OPT_INDENT_2
+
+
+def _dumps(obj: Any, compact: bool = False) -> str:
+    """Encode a tool result as JSON, using orjson when available.
+
+    Output is compact unless PRETTY_OUTPUT is enabled, in which case it is
+    indented except where compact is set (large results skip pretty-printing).
+    """
+    compact = compact or not PRETTY_OUTPUT
+    if orjson is not None:
+        option = _ORJSON_COMPACT if compact else _ORJSON_PRETTY
+        return orjson.dumps(obj, option=option, default=str).decode()
+    if compact:
+        return json.dumps(obj, separators=(",", ":"), default=str)
+    return json.dumps(obj, indent=2, default=str)
+
+
+# Error payloads with a fixed shape are serialized once at import. The
+# unknown-tool template takes the tool name already escaped as a JSON string.
+_TOKEN_NOT_FOUND_TEXT = _dumps(
+    {
+        "error": "DNSimple API token not found. Set DNSIMPLE_API_TOKEN environment variable or configure 1Password credentials.",
+    },
+)
+_UNKNOWN_TOOL_TEMPLATE = _dumps(
+    {
+        "error": "Unknown tool: %s",
+    },
+)
+
+
+def _text_result(text: str) -> List[TextContent]:
+    """Wrap already-serialized JSON text as a tool result."""
+    return [TextContent(type="text", text=text)]
+
+
+def _body_text(body: bytes) -> str:
+    """Decode a response body as UTF-8.
+
+    DNSimple always answers in UTF-8 JSON, so this skips the charset
+    detection that ``response.text`` runs on bodies without a declared charset.
+    """
+    return body.decode("utf-8", "replace")
+
+
+def _error_message(body: bytes) -> str:
+    """Get the API error message from a response body, falling back to the body."""
+    try:
+        message = _loads(body).get("message")
+    except (ValueError, AttributeError):
+        message = None
+    return message or _body_text(body)
+
+
+def _parse_env_file(path: Path) -> Dict[str, str]:
+    """Parse KEY=VALUE lines from a .env file."""
+    values = {}
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            value = value.strip()
+            # Remove quotes if present
+            if value.startswith('"') and value.endswith('"'):
+                value = value[1:-1]
+            elif value.startswith("'") and value.endswith("'"):
+                value = value[1:-1]
+            values.setdefault(key.strip(), value)
+    return values
+
+
+def _load_env_file() -> Dict[str, str]:
+    """Get .env values, re-parsing the file only if it has changed."""
+    global _ENV_CACHE
+
+    try:
+        mtime = ENV_FILE.stat().st_mtime
+    except OSError:
+        return {}
+
+    if _ENV_CACHE[0] != mtime:
+        try:
+            values = _parse_env_file(ENV_FILE)
+        except Exception:
+            values = {}
+        _ENV_CACHE = (mtime, values)
+
+    return _ENV_CACHE[1]
+
+
+_load_env_file()
+
+
+def load_token_from_env() -> Optional[str]:
+    """Load DNSimple API token from environment variable or .env file."""
+    # Environment variable has highest priority, then .env file in config directory
+    return (
+        os.getenv("DNSIMPLE_API_TOKEN")
+        or _load_env_file().get("DNSIMPLE_API_TOKEN")
+        or None
+    )
+
+
+def _import_credentials_module() -> Optional[ModuleType]:
+    """Import the 1Password credential utility.
+
+    DNSIMPLE_CREDENTIALS_MODULE may point at it directly, as a path to a .py
+    file or a dotted module name. Otherwise the parent repo layouts are probed.
+    """
+    configured = os.getenv("DNSIMPLE_CREDENTIALS_MODULE")
+    if configured:
+        if configured.endswith(".py") or os.sep in configured:
+            spec = importlib.util.spec_from_file_location(
+                "dnsimple_credentials", configured
+            )
+            if spec is None or spec.loader is None:
+                return None
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            return module
+        return importlib.import_module(configured)
+
     # Try importing from common locations (for backward compatibility)
     # First try parent repo structure (if running from this repo)
     server_dir = Path(__file__).parent
@@ -41,61 +373,39 @@ try:
         if credentials_path.exists():
             sys.path.insert(0, str(parent_path))
             try:
-                from execution.scripts.credentials import (
-                    get_credential,
-                    get_credential_by_domain,
-                )
-
-                HAS_CREDENTIALS_MODULE = True
-                break
+                return importlib.import_module("execution.scripts.credentials")
             except ImportError:
                 continue
-except Exception:
-    pass
-
-# Initialize MCP server
-app = Server("dnsimple")
 
+    return None
 
-def load_token_from_env() -> Optional[str]:
-    """Load DNSimple API token from environment variable or .env file."""
-    # First check environment variable (highest priority)
-    token = os.getenv("DNSIMPLE_API_TOKEN")
-    if token:
-        return token
 
-    # Then check .env file in config directory
-    if not ENV_FILE.exists():
-        return None
+def _load_credentials_module() -> Optional[ModuleType]:
+    """Get the 1Password credential utility, importing it on first use."""
+    global HAS_CREDENTIALS_MODULE, _CREDENTIALS_MODULE, _CREDENTIALS_PROBED
 
-    try:
-        with open(ENV_FILE, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith("DNSIMPLE_API_TOKEN="):
-                    token = line.split("=", 1)[1].strip()
-                    # Remove quotes if present
-                    if token.startswith('"') and token.endswith('"'):
-                        token = token[1:-1]
-                    elif token.startswith("'") and token.endswith("'"):
-                        token = token[1:-1]
-                    return token
-    except Exception:
-        pass
+    if not _CREDENTIALS_PROBED:
+        try:
+            _CREDENTIALS_MODULE = _import_credentials_module()
+        except Exception:
+            _CREDENTIALS_MODULE = None
+        HAS_CREDENTIALS_MODULE = _CREDENTIALS_MODULE is not None
+        _CREDENTIALS_PROBED = True
 
-    return None
+    return _CREDENTIALS_MODULE
 
 
 def get_dnsimple_token_from_1password() -> Optional[str]:
     """Get DNSimple API token from 1Password."""
-    if not HAS_CREDENTIALS_MODULE:
+    credentials = _load_credentials_module()
+    if credentials is None:
         return None
 
     try:
         field_names = ["access token", "api_token", "token", "api token"]
         for field_name in field_names:
             try:
-                token = get_credential("DNSimple", field=field_name)
+                token = credentials.get_credential("DNSimple", field=field_name)
                 if token:
                     return token
             except (ValueError, KeyError):
@@ -103,7 +413,9 @@ def get_dnsimple_token_from_1password() -> Optional[str]:
 
         for field_name in field_names:
             try:
-                token = get_credential_by_domain("dnsimple.com", field=field_name)
+                token = credentials.get_credential_by_domain(
+                    "dnsimple.com", field=field_name
+                )
                 if token:
                     return token
             except (ValueError, KeyError):
@@ -116,41 +428,98 @@ def get_dnsimple_token_from_1password() -> Optional[str]:
 
 def get_dnsimple_token() -> Optional[str]:
     """Get DNSimple API token from environment variable, .env file, or 1Password."""
+    global _TOKEN_CACHE
+
+    if _TOKEN_CACHE and _TOKEN_CACHE[0] > time.monotonic():
+        return _TOKEN_CACHE[1]
+
     # Priority: environment variable > .env file > 1Password
     token = load_token_from_env()
-    if token:
-        return token
+    if not token:
+        token = get_dnsimple_token_from_1password()
 
-    token = get_dnsimple_token_from_1password()
+    if token:
+        _TOKEN_CACHE = (time.monotonic() + TOKEN_TTL, token)
     return token
 
 
 def get_account_id(api_token: str) -> str:
-    """Get DNSimple account ID."""
-    headers = {
-        "Authorization": f"Bearer {api_token}",
-        "Accept": "application/json",
-    }
+    """Get DNSimple account ID, reusing the cached value for this token."""
+    cached = _ACCOUNT_ID_CACHE.get(api_token)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    # Concurrent tool calls with a cold cache wait for one lookup to finish
+    with _ACCOUNT_ID_LOCK:
+        cached = _ACCOUNT_ID_CACHE.get(api_token)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        account_id = _fetch_account_id(api_token)
+        _ACCOUNT_ID_CACHE[api_token] = (time.monotonic() + ACCOUNT_ID_TTL, account_id)
+        return account_id
+
 
-    response = requests.get(f"{DNSIMPLE_API_BASE}/whoami", headers=headers)
+def _authenticate_session(api_token: str) -> None:
+    """Set the session's Authorization header, if the token has changed."""
+    global _SESSION_TOKEN
+
+    if api_token != _SESSION_TOKEN:
+        SESSION.headers["Authorization"] = f"Bearer {api_token}"
+        _SESSION_TOKEN = api_token
+
+
+def _invalidate_credentials(response: requests.Response, *args, **kwargs) -> None:
+    """Drop cached credentials and reads when the API rejects our credentials."""
+    global _TOKEN_CACHE
+
+    if response.status_code not in (401, 403):
+        return
+
+    authorization = response.request.headers.get("Authorization", "")
+    api_token = authorization[len("Bearer ") :]
+    _ACCOUNT_ID_CACHE.pop(api_token, None)
+    if _TOKEN_CACHE and _TOKEN_CACHE[1] == api_token:
+        _TOKEN_CACHE = None
+    with _RECENT_READS_LOCK:
+        _RECENT_READS.clear()
+
+
+SESSION.hooks["response"].append(_invalidate_credentials)
+
+
+def _fetch_account_id(api_token: str) -> str:
+    """Look up the DNSimple account ID via the API."""
+    # Tokens whose /whoami account is null always need /accounts, so skip /whoami
+    if _ACCOUNT_LOOKUP_FLOW.get(api_token) == "accounts":
+        return _fetch_first_account_id()
+
+    response = SESSION.get(API_URLS["whoami"], timeout=REQUEST_TIMEOUT)
 
     if response.status_code != 200:
         response.raise_for_status()
 
-    data = response.json()
+    data = _loads(response.content)
 
     if not data or "data" not in data:
         raise ValueError("Invalid API response: missing 'data' key")
 
     account = data["data"].get("account")
     if account and account.get("id"):
+        _ACCOUNT_LOOKUP_FLOW[api_token] = "whoami"
         return str(account["id"])
 
     # If account is null, list accounts and use the first one
-    response = requests.get(f"{DNSIMPLE_API_BASE}/accounts", headers=headers)
+    _ACCOUNT_LOOKUP_FLOW[api_token] = "accounts"
+    return _fetch_first_account_id()
+
+
+def _fetch_first_account_id() -> str:
+    """Get the ID of the first account accessible to the token."""
+    response = SESSION.get(API_URLS["accounts"], timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
 
-    accounts_data = response.json()
+    accounts_data = _loads(response.content)
     if not accounts_data or "data" not in accounts_data or not accounts_data["data"]:
         raise ValueError("No accounts found. You may need to create an account first.")
 
@@ -158,1058 +527,1242 @@ def get_account_id(api_token: str) -> str:
     return str(account_id)
 
 
-def list_domains(api_token: str, account_id: str) -> List[Dict[str, Any]]:
-    """List all domains in the account."""
-    headers = {
-        "Authorization": f"Bearer {api_token}",
-        "Accept": "application/json",
-    }
+def _last_page(response: requests.Response) -> Optional[int]:
+    """Get the last page number from a response's Link header, if present."""
+    last = response.links.get("last")
+    if not last:
+        return None
+    pages = parse_qs(urlsplit(last["url"]).query).get("page")
+    if not pages or not pages[0].isdigit():
+        return None
+    return int(pages[0])
+
+
+def _get_all_pages(
+    url: str, params: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Get every page of a paginated list endpoint.
 
-    domains = []
-    page = 1
+    The first page is fetched to learn the page count; the remaining pages
+    are fetched concurrently and returned in page order.
+    """
 
-    while True:
-        response = requests.get(
-            f"{DNSIMPLE_API_BASE}/{account_id}/domains",
-            headers=headers,
-            params={"page": page, "per_page": 100},
+    def get_page(page: int) -> requests.Response:
+        response = SESSION.get(
+            url,
+            params={**(params or {}), "page": page, "per_page": 100},
+            timeout=REQUEST_TIMEOUT,
         )
         response.raise_for_status()
+        return response
 
-        data = response.json()
-        domains.extend(data.get("data", []))
+    response = get_page(1)
+    data = _loads(response.content)
+    items = list(data.get("data", []))
 
-        pagination = data.get("pagination", {})
-        if pagination.get("current_page", 0) >= pagination.get("total_pages", 1):
-            break
+    total_pages = _last_page(response)
+    if total_pages is None:
+        total_pages = data.get("pagination", {}).get("total_pages", 1)
+    if total_pages > 1:
+        with ThreadPoolExecutor(max_workers=PAGINATION_WORKERS) as executor:
+            for page_response in executor.map(get_page, range(2, total_pages + 1)):
+                items.extend(_loads(page_response.content).get("data", []))
 
-        page += 1
+    return items
 
-    return domains
 
+def list_domains(account_id: str) -> List[Dict[str, Any]]:
+    """List all domains in the account."""
+    return _get_all_pages(API_URLS["domains"].format(account=account_id))
 
-@app.list_tools()
-async def list_tools() -> List[Tool]:
-    """List available MCP tools."""
-    return [
-        Tool(
-            name="get_domain_costs",
-            description="Get pricing information for domains. Returns registration and renewal costs.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "domain_names": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of domain names to get pricing for. If empty, returns pricing for all domains in account.",
-                    },
+
+def _cache_db() -> sqlite3.Connection:
+    """Open the on-disk cache, creating it on first use."""
+    global _CACHE_DB
+
+    if _CACHE_DB is None:
+        db = sqlite3.connect(str(CACHE_FILE), check_same_thread=False)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS cache "
+            "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value BLOB NOT NULL)"
+        )
+        db.commit()
+        _CACHE_DB = db
+    return _CACHE_DB
+
+
+def _cache_get(key: str) -> Optional[bytes]:
+    """Get an unexpired raw response body from the on-disk cache."""
+    try:
+        with _CACHE_LOCK:
+            row = (
+                _cache_db()
+                .execute(
+                    "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+                    (key, time.time()),
+                )
+                .fetchone()
+            )
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
+def _cache_set(key: str, value: bytes, ttl: float = CACHE_TTL) -> None:
+    """Store a raw response body in the on-disk cache."""
+    try:
+        with _CACHE_LOCK:
+            db = _cache_db()
+            db.execute(
+                "INSERT OR REPLACE INTO cache (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, time.time() + ttl, value),
+            )
+            db.commit()
+    except sqlite3.Error:
+        pass
+
+
+def _cache_delete(key: str) -> None:
+    """Remove an entry from the on-disk cache."""
+    try:
+        with _CACHE_LOCK:
+            db = _cache_db()
+            db.execute("DELETE FROM cache WHERE key = ?", (key,))
+            db.commit()
+    except sqlite3.Error:
+        pass
+
+
+def _cached_get(cache_key: str, url: str) -> Optional[Dict[str, Any]]:
+    """GET a JSON resource, serving it from the on-disk cache when fresh.
+
+    Returns None if the request fails or does not return 200; failures are
+    not cached.
+    """
+    body = _cache_get(cache_key)
+    if body is None:
+        try:
+            response = SESSION.get(url, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+        body = response.content
+        _cache_set(cache_key, body)
+
+    try:
+        return _loads(body)
+    except ValueError:
+        _cache_delete(cache_key)
+        return None
+
+
+def _recent_get(url: str) -> Tuple[int, bytes]:
+    """GET a resource, reusing a successful response from the last minute.
+
+    Returns the status code and body.
+    """
+    now = time.monotonic()
+    with _RECENT_READS_LOCK:
+        cached = _RECENT_READS.get(url)
+    if cached and cached[0] > now:
+        return cached[1], cached[2]
+
+    response = SESSION.get(url, timeout=REQUEST_TIMEOUT)
+    status_code, body = response.status_code, response.content
+    if status_code == 200:
+        with _RECENT_READS_LOCK:
+            # Re-insert so entries stay ordered oldest first
+            _RECENT_READS.pop(url, None)
+            if len(_RECENT_READS) >= RECENT_READS_MAXSIZE:
+                del _RECENT_READS[next(iter(_RECENT_READS))]
+            _RECENT_READS[url] = (now + RECENT_READ_TTL, status_code, body)
+    return status_code, body
+
+
+def _forget_recent(url: str) -> None:
+    """Drop a reused response after the resource has been changed."""
+    with _RECENT_READS_LOCK:
+        _RECENT_READS.pop(url, None)
+
+
+def _domain_info_key(account_id: str, domain_name: str) -> str:
+    """Cache key for a domain's registrar info."""
+    return f"domain_info:{account_id}:{domain_name}"
+
+
+def _get_domain_info(account_id: str, domain_name: str) -> Optional[Dict[str, Any]]:
+    """Get registrar info for a domain, or None if it is unavailable."""
+    result = _cached_get(
+        _domain_info_key(account_id, domain_name),
+        API_URLS["registrar_domain"].format(account=account_id, domain=domain_name),
+    )
+    return result.get("data") if result else None
+
+
+def _get_tld(domain_name: str) -> str:
+    """Get the TLD a domain is priced under (e.g. 'com' or 'co.uk')."""
+    rest, _, tld = domain_name.rpartition(".")
+    second_level = rest.rpartition(".")[2]
+    if second_level and f"{second_level}.{tld}" in MULTIPART_TLDS:
+        return f"{second_level}.{tld}"
+    return tld
+
+
+def _get_tld_prices(account_id: str, tld: str) -> Optional[List[Dict[str, Any]]]:
+    """Get registrar prices for a TLD, reusing recent results.
+
+    Returns None if the prices could not be fetched; failures are not cached.
+    """
+    key = (account_id, tld)
+    now = time.monotonic()
+
+    with _TLD_PRICES_LOCK:
+        cached = _TLD_PRICES_CACHE.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    result = _cached_get(
+        f"tld_prices:{account_id}:{tld}",
+        API_URLS["tld_prices"].format(account=account_id, tld=tld),
+    )
+    if result is None:
+        return None
+    prices = result.get("data", [])
+
+    with _TLD_PRICES_LOCK:
+        _TLD_PRICES_CACHE[key] = (now + TLD_PRICES_TTL, prices)
+    return prices
+
+
+def _warm_tld_prices(
+    executor: ThreadPoolExecutor, account_id: str, domain_names: List[str]
+) -> None:
+    """Fetch prices for each distinct TLD once before per-domain lookups."""
+    tlds = {_get_tld(domain_name) for domain_name in domain_names}
+    list(executor.map(lambda tld: _get_tld_prices(account_id, tld), tlds))
+
+
+def _fetch_domain_pricing(account_id: str, domain_name: str) -> Dict[str, Any]:
+    """Get TLD pricing and registration info for a single domain."""
+    tld = _get_tld(domain_name)
+
+    # Get TLD pricing
+    prices_data = _get_tld_prices(account_id, tld) or []
+
+    # Try to get domain registration info
+    domain_data = _get_domain_info(account_id, domain_name)
+
+    return {
+        "domain": domain_name,
+        "domain_info": domain_data,
+        "prices": prices_data,
+    }
+
+
+def _fetch_renewal_cost(account_id: str, domain_name: str) -> Dict[str, Any]:
+    """Get expiry, auto-renew status and renewal price for a single domain."""
+    tld = _get_tld(domain_name)
+
+    # Get domain info
+    domain_data = _get_domain_info(account_id, domain_name)
+
+    # Get renewal price
+    prices = _get_tld_prices(account_id, tld) or []
+    renewal_price = next((p for p in prices if p.get("operation") == "renew"), None)
+
+    detail = {
+        "domain": domain_name,
+        "expires_at": domain_data.get("expires_at") if domain_data else None,
+        "auto_renew": domain_data.get("auto_renew", False) if domain_data else None,
+        "renewal_price": None,
+        "currency": None,
+    }
+    if renewal_price:
+        detail["renewal_price"] = float(renewal_price.get("price", 0))
+        detail["currency"] = renewal_price.get("currency", "USD")
+
+    return detail
+
+
+def _disable_autorenew(account_id: str, domain_name: str) -> Dict[str, Any]:
+    """Disable auto-renewal for a single domain."""
+    response = SESSION.patch(
+        API_URLS["registrar_domain"].format(account=account_id, domain=domain_name),
+        json={"auto_renew": False},
+        timeout=REQUEST_TIMEOUT,
+    )
+
+    if response.status_code == 200:
+        _cache_delete(_domain_info_key(account_id, domain_name))
+        return {
+            "domain": domain_name,
+            "status": "disabled",
+            "error": None,
+        }
+    return {
+        "domain": domain_name,
+        "status": "failed",
+        "error": f"API Error {response.status_code}: {_body_text(response.content)}",
+    }
+
+
+# Tool definitions are static, so build them once at import
+_TOOLS: List[Tool] = [
+    Tool(
+        name="get_domain_costs",
+        description="Get pricing information for domains. Returns registration and renewal costs.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of domain names to get pricing for. If empty, returns pricing for all domains in account.",
                 },
             },
-        ),
-        Tool(
-            name="get_renewal_costs",
-            description="Get renewal costs for domains. Returns total annual renewal cost and per-domain breakdown.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "domain_names": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of domain names to get renewal costs for. If empty, returns costs for all domains in account.",
-                    },
+        },
+    ),
+    Tool(
+        name="get_renewal_costs",
+        description="Get renewal costs for domains. Returns total annual renewal cost and per-domain breakdown.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of domain names to get renewal costs for. If empty, returns costs for all domains in account.",
                 },
             },
-        ),
-        Tool(
-            name="configure_dns_record",
-            description="Create or update a DNS record. If a record with the same name and type exists, it will be updated.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "domain_name": {
-                        "type": "string",
-                        "description": "Domain name (e.g., 'example.com')",
-                    },
-                    "name": {
-                        "type": "string",
-                        "description": "Record name (e.g., 'www' or '@' for root domain)",
-                    },
-                    "type": {
-                        "type": "string",
-                        "enum": [
-                            "A",
-                            "AAAA",
-                            "CNAME",
-                            "MX",
-                            "TXT",
-                            "NS",
-                            "SRV",
-                            "ALIAS",
-                            "URL",
-                        ],
-                        "description": "DNS record type (URL = DNSimple redirect to target URL)",
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "Record content (IP address for A/AAAA, hostname for CNAME, etc.)",
-                    },
-                    "ttl": {
-                        "type": "integer",
-                        "description": "TTL in seconds (default: 3600)",
-                        "default": 3600,
-                    },
-                    "priority": {
-                        "type": "integer",
-                        "description": "Priority for MX records (optional)",
-                    },
+        },
+    ),
+    Tool(
+        name="configure_dns_record",
+        description="Create or update a DNS record. If a record with the same name and type exists, it will be updated.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain_name": {
+                    "type": "string",
+                    "description": "Domain name (e.g., 'example.com')",
                 },
-                "required": ["domain_name", "name", "type", "content"],
-            },
-        ),
-        Tool(
-            name="list_dns_records",
-            description="List DNS records for a domain.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "domain_name": {
-                        "type": "string",
-                        "description": "Domain name (e.g., 'example.com')",
-                    },
-                    "name": {
-                        "type": "string",
-                        "description": "Filter by record name (optional)",
-                    },
-                    "type": {
-                        "type": "string",
-                        "description": "Filter by record type (optional)",
-                    },
+                "name": {
+                    "type": "string",
+                    "description": "Record name (e.g., 'www' or '@' for root domain)",
+                },
+                "type": {
+                    "type": "string",
+                    "enum": [
+                        "A",
+                        "AAAA",
+                        "CNAME",
+                        "MX",
+                        "TXT",
+                        "NS",
+                        "SRV",
+                        "ALIAS",
+                        "URL",
+                    ],
+                    "description": "DNS record type (URL = DNSimple redirect to target URL)",
+                },
+                "content": {
+                    "type": "string",
+                    "description": "Record content (IP address for A/AAAA, hostname for CNAME, etc.)",
+                },
+                "ttl": {
+                    "type": "integer",
+                    "description": "TTL in seconds (default: 3600)",
+                    "default": 3600,
+                },
+                "priority": {
+                    "type": "integer",
+                    "description": "Priority for MX records (optional)",
                 },
-                "required": ["domain_name"],
             },
-        ),
-        Tool(
-            name="delete_dns_record",
-            description="Delete a DNS record by ID.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "domain_name": {
-                        "type": "string",
-                        "description": "Domain name (e.g., 'example.com')",
-                    },
-                    "record_id": {
-                        "type": "string",
-                        "description": "DNS record ID to delete",
-                    },
+            "required": ["domain_name", "name", "type", "content"],
+        },
+    ),
+    Tool(
+        name="list_dns_records",
+        description="List DNS records for a domain.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain_name": {
+                    "type": "string",
+                    "description": "Domain name (e.g., 'example.com')",
+                },
+                "name": {
+                    "type": "string",
+                    "description": "Filter by record name (optional)",
+                },
+                "type": {
+                    "type": "string",
+                    "description": "Filter by record type (optional)",
                 },
-                "required": ["domain_name", "record_id"],
             },
-        ),
-        Tool(
-            name="disable_autorenew",
-            description="Disable auto-renewal for one or more domains.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "domain_names": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of domain names to disable auto-renewal for",
-                    },
+            "required": ["domain_name"],
+        },
+    ),
+    Tool(
+        name="delete_dns_record",
+        description="Delete a DNS record by ID.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain_name": {
+                    "type": "string",
+                    "description": "Domain name (e.g., 'example.com')",
+                },
+                "record_id": {
+                    "type": "string",
+                    "description": "DNS record ID to delete",
                 },
-                "required": ["domain_names"],
             },
-        ),
-        Tool(
-            name="transfer_domain",
-            description="Initiate a domain transfer to DNSimple. Requires authorization code from current registrar.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "domain_name": {
-                        "type": "string",
-                        "description": "Domain name to transfer",
-                    },
-                    "auth_code": {
-                        "type": "string",
-                        "description": "Authorization code (EPP code) from current registrar",
-                    },
-                    "registrant_id": {
-                        "type": "string",
-                        "description": "Registrant ID (optional, uses account default if not provided)",
-                    },
+            "required": ["domain_name", "record_id"],
+        },
+    ),
+    Tool(
+        name="disable_autorenew",
+        description="Disable auto-renewal for one or more domains.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of domain names to disable auto-renewal for",
                 },
-                "required": ["domain_name", "auth_code"],
             },
-        ),
-        Tool(
-            name="list_domains",
-            description="List all domains in the DNSimple account.",
-            inputSchema={
-                "type": "object",
-                "properties": {},
+            "required": ["domain_names"],
+        },
+    ),
+    Tool(
+        name="transfer_domain",
+        description="Initiate a domain transfer to DNSimple. Requires authorization code from current registrar.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain_name": {
+                    "type": "string",
+                    "description": "Domain name to transfer",
+                },
+                "auth_code": {
+                    "type": "string",
+                    "description": "Authorization code (EPP code) from current registrar",
+                },
+                "registrant_id": {
+                    "type": "string",
+                    "description": "Registrant ID (optional, uses account default if not provided)",
+                },
             },
-        ),
-        Tool(
-            name="get_domain_nameservers",
-            description="Get current delegated nameservers for a domain.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "domain_name": {
-                        "type": "string",
-                        "description": "Domain name (e.g., 'example.com')",
-                    },
+            "required": ["domain_name", "auth_code"],
+        },
+    ),
+    Tool(
+        name="list_domains",
+        description="List all domains in the DNSimple account.",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+        },
+    ),
+    Tool(
+        name="get_domain_nameservers",
+        description="Get current delegated nameservers for a domain.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain_name": {
+                    "type": "string",
+                    "description": "Domain name (e.g., 'example.com')",
                 },
-                "required": ["domain_name"],
             },
-        ),
-        Tool(
-            name="update_domain_nameservers",
-            description="Replace delegated nameservers for a domain (registrar delegation update).",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "domain_name": {
-                        "type": "string",
-                        "description": "Domain name (e.g., 'example.com')",
-                    },
-                    "nameservers": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Full nameserver hostnames to set (e.g., ['ns1.example.com', 'ns2.example.com'])",
-                        "minItems": 2,
-                    },
+            "required": ["domain_name"],
+        },
+    ),
+    Tool(
+        name="update_domain_nameservers",
+        description="Replace delegated nameservers for a domain (registrar delegation update).",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain_name": {
+                    "type": "string",
+                    "description": "Domain name (e.g., 'example.com')",
+                },
+                "nameservers": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Full nameserver hostnames to set (e.g., ['ns1.example.com', 'ns2.example.com'])",
+                    "minItems": 2,
                 },
-                "required": ["domain_name", "nameservers"],
             },
-        ),
-        Tool(
-            name="get_whois_privacy",
-            description="Get whois privacy status for a domain.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "domain_name": {
-                        "type": "string",
-                        "description": "Domain name (e.g., 'example.com')",
-                    },
+            "required": ["domain_name", "nameservers"],
+        },
+    ),
+    Tool(
+        name="get_whois_privacy",
+        description="Get whois privacy status for a domain.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain_name": {
+                    "type": "string",
+                    "description": "Domain name (e.g., 'example.com')",
                 },
-                "required": ["domain_name"],
             },
-        ),
-        Tool(
-            name="enable_whois_privacy",
-            description="Enable whois privacy (domain privacy) for a domain. This will purchase and enable whois privacy if not already enabled.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "domain_name": {
-                        "type": "string",
-                        "description": "Domain name (e.g., 'example.com')",
-                    },
+            "required": ["domain_name"],
+        },
+    ),
+    Tool(
+        name="enable_whois_privacy",
+        description="Enable whois privacy (domain privacy) for a domain. This will purchase and enable whois privacy if not already enabled.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain_name": {
+                    "type": "string",
+                    "description": "Domain name (e.g., 'example.com')",
                 },
-                "required": ["domain_name"],
             },
-        ),
-    ]
+            "required": ["domain_name"],
+        },
+    ),
+]
 
+# Argument validators compiled once per tool, so calls skip re-parsing schemas
+_VALIDATORS: Dict[str, jsonschema.Draft7Validator] = {
+    tool.name: jsonschema.Draft7Validator(tool.inputSchema) for tool in _TOOLS
+}
 
-@app.call_tool()
-async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
-    """Handle tool calls."""
-    api_token = get_dnsimple_token()
 
-    if not api_token:
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps(
+@app.list_tools()
+async def list_tools() -> List[Tool]:
+    """List available MCP tools."""
+    return _TOOLS
+
+
+def _handle_get_domain_costs(
+    account_id: str, arguments: Dict[str, Any]
+) -> List[TextContent]:
+    """Get TLD pricing and registration info for domains."""
+    domain_names = arguments.get("domain_names", [])
+
+    if not domain_names:
+        # Get all domains
+        try:
+            domains = list_domains(account_id)
+            domain_names = [d["name"] for d in domains]
+        except Exception as e:
+            return _text_result(
+                _dumps(
                     {
-                        "error": "DNSimple API token not found. Set DNSIMPLE_API_TOKEN environment variable or configure 1Password credentials.",
+                        "error": f"Failed to list domains: {str(e)}",
                     },
-                    indent=2,
-                ),
+                )
             )
-        ]
 
-    try:
-        account_id = get_account_id(api_token)
-    except Exception as e:
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps(
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        _warm_tld_prices(executor, account_id, domain_names)
+        results = list(
+            executor.map(
+                lambda domain_name: _fetch_domain_pricing(account_id, domain_name),
+                domain_names,
+            )
+        )
+
+    return _text_result(
+        _dumps(
+            {
+                "account_id": account_id,
+                "domains": results,
+            },
+        )
+    )
+
+
+def _handle_get_renewal_costs(
+    account_id: str, arguments: Dict[str, Any]
+) -> List[TextContent]:
+    """Get renewal costs for domains."""
+    domain_names = arguments.get("domain_names", [])
+
+    if not domain_names:
+        try:
+            domains = list_domains(account_id)
+            domain_names = [d["name"] for d in domains]
+        except Exception as e:
+            return _text_result(
+                _dumps(
                     {
-                        "error": f"Failed to get account ID: {str(e)}",
+                        "error": f"Failed to list domains: {str(e)}",
                     },
-                    indent=2,
-                ),
+                )
             )
-        ]
 
-    headers = {
-        "Authorization": f"Bearer {api_token}",
-        "Accept": "application/json",
-    }
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        _warm_tld_prices(executor, account_id, domain_names)
+        domain_details = list(
+            executor.map(
+                lambda domain_name: _fetch_renewal_cost(account_id, domain_name),
+                domain_names,
+            )
+        )
 
-    if name == "get_domain_costs":
-        domain_names = arguments.get("domain_names", [])
+    total_renewal_cost = 0
+    for detail in domain_details:
+        if detail["renewal_price"] is not None:
+            total_renewal_cost += detail["renewal_price"]
+
+    return _text_result(
+        _dumps(
+            {
+                "account_id": account_id,
+                "total_domains": len(domain_names),
+                "total_annual_renewal_cost": total_renewal_cost,
+                "domains": domain_details,
+            },
+        )
+    )
 
-        if not domain_names:
-            # Get all domains
-            try:
-                domains = list_domains(api_token, account_id)
-                domain_names = [d["name"] for d in domains]
-            except Exception as e:
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            {
-                                "error": f"Failed to list domains: {str(e)}",
-                            },
-                            indent=2,
-                        ),
-                    )
-                ]
-
-        results = []
-        for domain_name in domain_names:
-            tld = domain_name.split(".")[-1]
-
-            # Get TLD pricing
-            try:
-                response = requests.get(
-                    f"{DNSIMPLE_API_BASE}/{account_id}/registrar/tlds/{tld}/prices",
-                    headers=headers,
-                )
-                prices_data = []
-                if response.status_code == 200:
-                    result = response.json()
-                    prices_data = result.get("data", [])
-            except Exception as e:
-                prices_data = []
-
-            # Try to get domain registration info
-            domain_data = None
-            try:
-                response = requests.get(
-                    f"{DNSIMPLE_API_BASE}/{account_id}/registrar/domains/{domain_name}",
-                    headers=headers,
-                )
-                if response.status_code == 200:
-                    domain_data = response.json().get("data")
-            except:
-                pass
 
-            results.append(
+def _handle_configure_dns_record(
+    account_id: str, arguments: Dict[str, Any]
+) -> List[TextContent]:
+    """Create or update a DNS record."""
+    domain_name = arguments["domain_name"]
+    record_name = arguments["name"]
+    record_type = arguments["type"]
+    content = arguments["content"]
+    ttl = arguments.get("ttl", 3600)
+    priority = arguments.get("priority")
+
+    # First, check if record exists
+    try:
+        response = SESSION.get(
+            API_URLS["zone_records"].format(account=account_id, domain=domain_name),
+            params={"name": record_name, "type": record_type},
+            timeout=REQUEST_TIMEOUT,
+        )
+        response.raise_for_status()
+        existing_records = _loads(response.content).get("data", [])
+    except:
+        existing_records = []
+
+    # Prepare record data
+    record_data = {
+        "name": record_name,
+        "type": record_type,
+        "content": content,
+        "ttl": ttl,
+    }
+    if priority is not None:
+        record_data["priority"] = priority
+
+    if existing_records:
+        # Update existing record
+        record_id = existing_records[0]["id"]
+        response = SESSION.patch(
+            API_URLS["zone_record"].format(
+                account=account_id, domain=domain_name, record=record_id
+            ),
+            json=record_data,
+            timeout=REQUEST_TIMEOUT,
+        )
+        action = "updated"
+    else:
+        # Create new record
+        response = SESSION.post(
+            API_URLS["zone_records"].format(account=account_id, domain=domain_name),
+            json=record_data,
+            timeout=REQUEST_TIMEOUT,
+        )
+        action = "created"
+
+    if response.status_code in [200, 201]:
+        return _text_result(
+            _dumps(
                 {
-                    "domain": domain_name,
-                    "domain_info": domain_data,
-                    "prices": prices_data,
-                }
+                    "success": True,
+                    "action": action,
+                    "record": _loads(response.content).get("data"),
+                },
             )
-
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps(
-                    {
-                        "account_id": account_id,
-                        "domains": results,
-                    },
-                    indent=2,
-                    default=str,
-                ),
+        )
+    else:
+        return _text_result(
+            _dumps(
+                {
+                    "error": f"Failed to {action} DNS record: {response.status_code}",
+                    "response": _body_text(response.content),
+                },
             )
-        ]
+        )
 
-    elif name == "get_renewal_costs":
-        domain_names = arguments.get("domain_names", [])
 
-        if not domain_names:
-            try:
-                domains = list_domains(api_token, account_id)
-                domain_names = [d["name"] for d in domains]
-            except Exception as e:
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            {
-                                "error": f"Failed to list domains: {str(e)}",
-                            },
-                            indent=2,
-                        ),
-                    )
-                ]
-
-        total_renewal_cost = 0
-        domain_details = []
-
-        for domain_name in domain_names:
-            tld = domain_name.split(".")[-1]
-
-            # Get domain info
-            try:
-                response = requests.get(
-                    f"{DNSIMPLE_API_BASE}/{account_id}/registrar/domains/{domain_name}",
-                    headers=headers,
-                )
-                domain_data = (
-                    response.json().get("data") if response.status_code == 200 else None
-                )
-            except:
-                domain_data = None
+def _handle_list_dns_records(
+    account_id: str, arguments: Dict[str, Any]
+) -> List[TextContent]:
+    """List DNS records for a domain."""
+    domain_name = arguments["domain_name"]
+    filter_name = arguments.get("name")
+    filter_type = arguments.get("type")
+
+    params = {}
+    if filter_name:
+        params["name"] = filter_name
+    if filter_type:
+        params["type"] = filter_type
+
+    records = _get_all_pages(
+        API_URLS["zone_records"].format(account=account_id, domain=domain_name),
+        params,
+    )
+
+    return _text_result(
+        _dumps(
+            {
+                "domain": domain_name,
+                "count": len(records),
+                "records": records,
+            },
+            compact=len(records) > LARGE_RESULT_SIZE,
+        )
+    )
 
-            # Get renewal price
-            renewal_price = None
-            try:
-                response = requests.get(
-                    f"{DNSIMPLE_API_BASE}/{account_id}/registrar/tlds/{tld}/prices",
-                    headers=headers,
-                )
-                if response.status_code == 200:
-                    prices = response.json().get("data", [])
-                    renewal_price = next(
-                        (p for p in prices if p.get("operation") == "renew"), None
-                    )
-            except:
-                pass
-
-            if renewal_price:
-                amount = float(renewal_price.get("price", 0))
-                currency = renewal_price.get("currency", "USD")
-                total_renewal_cost += amount
-
-                domain_details.append(
-                    {
-                        "domain": domain_name,
-                        "expires_at": (
-                            domain_data.get("expires_at") if domain_data else None
-                        ),
-                        "auto_renew": (
-                            domain_data.get("auto_renew", False)
-                            if domain_data
-                            else None
-                        ),
-                        "renewal_price": amount,
-                        "currency": currency,
-                    }
-                )
-            else:
-                domain_details.append(
-                    {
-                        "domain": domain_name,
-                        "expires_at": (
-                            domain_data.get("expires_at") if domain_data else None
-                        ),
-                        "auto_renew": (
-                            domain_data.get("auto_renew", False)
-                            if domain_data
-                            else None
-                        ),
-                        "renewal_price": None,
-                        "currency": None,
-                    }
-                )
 
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps(
-                    {
-                        "account_id": account_id,
-                        "total_domains": len(domain_names),
-                        "total_annual_renewal_cost": total_renewal_cost,
-                        "domains": domain_details,
-                    },
-                    indent=2,
-                    default=str,
-                ),
-            )
-        ]
+def _handle_delete_dns_record(
+    account_id: str, arguments: Dict[str, Any]
+) -> List[TextContent]:
+    """Delete a DNS record by ID."""
+    domain_name = arguments["domain_name"]
+    record_id = arguments["record_id"]
 
-    elif name == "configure_dns_record":
-        domain_name = arguments["domain_name"]
-        record_name = arguments["name"]
-        record_type = arguments["type"]
-        content = arguments["content"]
-        ttl = arguments.get("ttl", 3600)
-        priority = arguments.get("priority")
+    response = SESSION.delete(
+        API_URLS["zone_record"].format(
+            account=account_id, domain=domain_name, record=record_id
+        ),
+        timeout=REQUEST_TIMEOUT,
+    )
 
-        # First, check if record exists
-        try:
-            response = requests.get(
-                f"{DNSIMPLE_API_BASE}/{account_id}/zones/{domain_name}/records",
-                headers=headers,
-                params={"name": record_name, "type": record_type},
+    if response.status_code in [200, 204]:
+        return _text_result(
+            _dumps(
+                {
+                    "success": True,
+                    "message": f"DNS record {record_id} deleted",
+                },
             )
-            response.raise_for_status()
-            existing_records = response.json().get("data", [])
-        except:
-            existing_records = []
-
-        # Prepare record data
-        record_data = {
-            "name": record_name,
-            "type": record_type,
-            "content": content,
-            "ttl": ttl,
-        }
-        if priority is not None:
-            record_data["priority"] = priority
-
-        if existing_records:
-            # Update existing record
-            record_id = existing_records[0]["id"]
-            response = requests.patch(
-                f"{DNSIMPLE_API_BASE}/{account_id}/zones/{domain_name}/records/{record_id}",
-                headers={**headers, "Content-Type": "application/json"},
-                json=record_data,
+        )
+    else:
+        return _text_result(
+            _dumps(
+                {
+                    "error": f"Failed to delete DNS record: {response.status_code}",
+                    "response": _body_text(response.content),
+                },
             )
-            action = "updated"
-        else:
-            # Create new record
-            response = requests.post(
-                f"{DNSIMPLE_API_BASE}/{account_id}/zones/{domain_name}/records",
-                headers={**headers, "Content-Type": "application/json"},
-                json=record_data,
+        )
+
+
+def _handle_disable_autorenew(
+    account_id: str, arguments: Dict[str, Any]
+) -> List[TextContent]:
+    """Disable auto-renewal for one or more domains."""
+    domain_names = arguments["domain_names"]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(
+            executor.map(
+                lambda domain_name: _disable_autorenew(account_id, domain_name),
+                domain_names,
             )
-            action = "created"
-
-        if response.status_code in [200, 201]:
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "success": True,
-                            "action": action,
-                            "record": response.json().get("data"),
-                        },
-                        indent=2,
-                        default=str,
-                    ),
-                )
-            ]
-        else:
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "error": f"Failed to {action} DNS record: {response.status_code}",
-                            "response": response.text,
-                        },
-                        indent=2,
-                    ),
-                )
-            ]
+        )
 
-    elif name == "list_dns_records":
-        domain_name = arguments["domain_name"]
-        filter_name = arguments.get("name")
-        filter_type = arguments.get("type")
+    return _text_result(
+        _dumps(
+            {
+                "results": results,
+            },
+        )
+    )
 
-        records = []
-        page = 1
 
-        while True:
-            params = {"page": page, "per_page": 100}
-            if filter_name:
-                params["name"] = filter_name
-            if filter_type:
-                params["type"] = filter_type
-
-            response = requests.get(
-                f"{DNSIMPLE_API_BASE}/{account_id}/zones/{domain_name}/records",
-                headers=headers,
-                params=params,
+def _handle_transfer_domain(
+    account_id: str, arguments: Dict[str, Any]
+) -> List[TextContent]:
+    """Initiate a domain transfer to DNSimple."""
+    domain_name = arguments["domain_name"]
+    auth_code = arguments["auth_code"]
+    registrant_id = arguments.get("registrant_id")
+
+    data = {
+        "auth_code": auth_code,
+    }
+    if registrant_id:
+        data["registrant_id"] = registrant_id
+
+    response = SESSION.post(
+        API_URLS["transfers"].format(account=account_id, domain=domain_name),
+        json=data,
+        timeout=REQUEST_TIMEOUT,
+    )
+
+    if response.status_code in [200, 201]:
+        return _text_result(
+            _dumps(
+                {
+                    "success": True,
+                    "transfer": _loads(response.content).get("data"),
+                },
+            )
+        )
+    else:
+        error_message = _error_message(response.content)
+
+        return _text_result(
+            _dumps(
+                {
+                    "error": f"Failed to initiate transfer: {response.status_code}",
+                    "message": error_message,
+                },
             )
-            response.raise_for_status()
+        )
 
-            data = response.json()
-            records.extend(data.get("data", []))
 
-            pagination = data.get("pagination", {})
-            if pagination.get("current_page", 0) >= pagination.get("total_pages", 1):
-                break
+def _handle_list_domains(
+    account_id: str, arguments: Dict[str, Any]
+) -> List[TextContent]:
+    """List all domains in the account."""
+    try:
+        domains = list_domains(account_id)
+        return _text_result(
+            _dumps(
+                {
+                    "account_id": account_id,
+                    "count": len(domains),
+                    "domains": domains,
+                },
+                compact=len(domains) > LARGE_RESULT_SIZE,
+            )
+        )
+    except Exception as e:
+        return _text_result(
+            _dumps(
+                {
+                    "error": f"Failed to list domains: {str(e)}",
+                },
+            )
+        )
 
-            page += 1
 
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps(
-                    {
-                        "domain": domain_name,
-                        "count": len(records),
-                        "records": records,
-                    },
-                    indent=2,
-                    default=str,
-                ),
+def _handle_get_domain_nameservers(
+    account_id: str, arguments: Dict[str, Any]
+) -> List[TextContent]:
+    """Get delegated nameservers for a domain."""
+    domain_name = arguments["domain_name"]
+
+    status_code, body = _recent_get(
+        API_URLS["delegation"].format(account=account_id, domain=domain_name),
+    )
+
+    if status_code == 200:
+        raw_data = _loads(body).get("data")
+        if isinstance(raw_data, list):
+            nameservers_list = raw_data
+            payload = {"name_servers": raw_data}
+        elif isinstance(raw_data, dict):
+            nameservers_list = raw_data.get("name_servers", [])
+            payload = raw_data
+        else:
+            nameservers_list = []
+            payload = {"name_servers": []}
+        return _text_result(
+            _dumps(
+                {
+                    "domain": domain_name,
+                    "nameservers": nameservers_list,
+                    "delegation": payload,
+                },
+            )
+        )
+    else:
+        return _text_result(
+            _dumps(
+                {
+                    "error": f"Failed to get domain nameservers: {status_code}",
+                    "response": _body_text(body),
+                },
             )
-        ]
+        )
+
 
-    elif name == "delete_dns_record":
-        domain_name = arguments["domain_name"]
-        record_id = arguments["record_id"]
+def _handle_update_domain_nameservers(
+    account_id: str, arguments: Dict[str, Any]
+) -> List[TextContent]:
+    """Replace delegated nameservers for a domain."""
+    domain_name = arguments["domain_name"]
+    nameservers = arguments.get("nameservers", [])
+    normalized_nameservers = [
+        str(ns).strip().rstrip(".").lower()
+        for ns in nameservers
+        if str(ns).strip()
+    ]
 
-        response = requests.delete(
-            f"{DNSIMPLE_API_BASE}/{account_id}/zones/{domain_name}/records/{record_id}",
-            headers=headers,
+    if len(normalized_nameservers) < 2:
+        return _text_result(
+            _dumps(
+                {
+                    "error": "At least two nameservers are required.",
+                },
+            )
         )
 
-        if response.status_code in [200, 204]:
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "success": True,
-                            "message": f"DNS record {record_id} deleted",
-                        },
-                        indent=2,
-                    ),
-                )
-            ]
+    delegation_url = API_URLS["delegation"].format(
+        account=account_id, domain=domain_name
+    )
+    response = SESSION.put(
+        delegation_url,
+        json=normalized_nameservers,
+        timeout=REQUEST_TIMEOUT,
+    )
+
+    if response.status_code == 200:
+        _forget_recent(delegation_url)
+        raw_data = _loads(response.content).get("data")
+        if isinstance(raw_data, list):
+            nameservers_list = raw_data
+            payload = {"name_servers": raw_data}
+        elif isinstance(raw_data, dict):
+            nameservers_list = raw_data.get("name_servers", normalized_nameservers)
+            payload = raw_data
         else:
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "error": f"Failed to delete DNS record: {response.status_code}",
-                            "response": response.text,
-                        },
-                        indent=2,
-                    ),
-                )
-            ]
-
-    elif name == "disable_autorenew":
-        domain_names = arguments["domain_names"]
-        results = []
-
-        for domain_name in domain_names:
-            data = {"auto_renew": False}
-            response = requests.patch(
-                f"{DNSIMPLE_API_BASE}/{account_id}/registrar/domains/{domain_name}",
-                headers={**headers, "Content-Type": "application/json"},
-                json=data,
+            nameservers_list = normalized_nameservers
+            payload = {"name_servers": normalized_nameservers}
+        return _text_result(
+            _dumps(
+                {
+                    "success": True,
+                    "domain": domain_name,
+                    "nameservers": nameservers_list,
+                    "delegation": payload,
+                },
             )
+        )
+    else:
+        return _text_result(
+            _dumps(
+                {
+                    "error": f"Failed to update nameservers: {response.status_code}",
+                    "response": _body_text(response.content),
+                },
+            )
+        )
+
 
-            if response.status_code == 200:
-                results.append(
+def _handle_get_whois_privacy(
+    account_id: str, arguments: Dict[str, Any]
+) -> List[TextContent]:
+    """Get whois privacy status for a domain."""
+    domain_name = arguments["domain_name"]
+
+    try:
+        status_code, body = _recent_get(
+            API_URLS["whois_privacy"].format(account=account_id, domain=domain_name),
+        )
+
+        if status_code == 200:
+            whois_data = _loads(body).get("data") or {}
+            return _text_result(
+                _dumps(
                     {
                         "domain": domain_name,
-                        "status": "disabled",
-                        "error": None,
-                    }
+                        "whois_privacy": whois_data,
+                        "enabled": whois_data.get("enabled", False),
+                        "expires_on": whois_data.get("expires_on"),
+                    },
                 )
-            else:
-                results.append(
+            )
+        elif status_code == 404:
+            return _text_result(
+                _dumps(
                     {
                         "domain": domain_name,
-                        "status": "failed",
-                        "error": f"API Error {response.status_code}: {response.text}",
-                    }
+                        "enabled": False,
+                        "message": "Whois privacy not purchased or not available for this domain",
+                    },
                 )
+            )
+        else:
+            error_message = _error_message(body)
 
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps(
+            return _text_result(
+                _dumps(
                     {
-                        "results": results,
+                        "error": f"Failed to get whois privacy status: {status_code}",
+                        "message": error_message,
                     },
-                    indent=2,
-                    default=str,
-                ),
+                )
+            )
+    except (requests.RequestException, ValueError) as e:
+        return _text_result(
+            _dumps(
+                {
+                    "error": f"Failed to get whois privacy: {str(e)}",
+                },
             )
-        ]
+        )
 
-    elif name == "transfer_domain":
-        domain_name = arguments["domain_name"]
-        auth_code = arguments["auth_code"]
-        registrant_id = arguments.get("registrant_id")
 
-        data = {
-            "auth_code": auth_code,
-        }
-        if registrant_id:
-            data["registrant_id"] = registrant_id
+# (purchased, message) reported for each successful enable-whois-privacy
+# response. A 200 only says privacy had been purchased before; it may have been
+# disabled until this call, so both cases are reported as enabled.
+_WHOIS_PRIVACY_ENABLED = {
+    201: (True, "Whois privacy has been purchased and enabled for this domain"),
+    200: (
+        False,
+        "Whois privacy was already purchased and is enabled for this domain",
+    ),
+}
 
-        response = requests.post(
-            f"{DNSIMPLE_API_BASE}/{account_id}/registrar/domains/{domain_name}/transfers",
-            headers={**headers, "Content-Type": "application/json"},
-            json=data,
-        )
 
-        if response.status_code in [200, 201]:
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "success": True,
-                            "transfer": response.json().get("data"),
-                        },
-                        indent=2,
-                        default=str,
-                    ),
+def _handle_enable_whois_privacy(
+    account_id: str, arguments: Dict[str, Any]
+) -> List[TextContent]:
+    """Enable whois privacy for a domain."""
+    domain_name = arguments["domain_name"]
+
+    try:
+        # Enable/purchase whois privacy. The PUT is idempotent: DNSimple answers
+        # 201 when it purchased privacy for this call and 200 when privacy had
+        # already been purchased, so no separate status check is needed.
+        whois_privacy_url = API_URLS["whois_privacy"].format(
+            account=account_id, domain=domain_name
+        )
+        response = SESSION.put(whois_privacy_url, timeout=REQUEST_TIMEOUT)
+
+        if response.status_code in _WHOIS_PRIVACY_ENABLED:
+            whois_data = _loads(response.content).get("data") or {}
+            _cache_delete(_domain_info_key(account_id, domain_name))
+            _forget_recent(whois_privacy_url)
+            purchased, message = _WHOIS_PRIVACY_ENABLED[response.status_code]
+            return _text_result(
+                _dumps(
+                    {
+                        "success": True,
+                        "domain": domain_name,
+                        "status": "enabled",
+                        "purchased": purchased,
+                        "message": message,
+                        "whois_privacy": whois_data,
+                    },
                 )
-            ]
+            )
         else:
-            error_text = response.text
-            try:
-                error_json = response.json()
-                error_message = error_json.get("message", error_text)
-            except:
-                error_message = error_text
-
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "error": f"Failed to initiate transfer: {response.status_code}",
-                            "message": error_message,
-                        },
-                        indent=2,
-                    ),
-                )
-            ]
+            error_message = _error_message(response.content)
 
-    elif name == "list_domains":
-        try:
-            domains = list_domains(api_token, account_id)
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "account_id": account_id,
-                            "count": len(domains),
-                            "domains": domains,
-                        },
-                        indent=2,
-                        default=str,
-                    ),
-                )
-            ]
-        except Exception as e:
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "error": f"Failed to list domains: {str(e)}",
-                        },
-                        indent=2,
-                    ),
+            return _text_result(
+                _dumps(
+                    {
+                        "error": f"Failed to enable whois privacy: {response.status_code}",
+                        "message": error_message,
+                    },
                 )
-            ]
+            )
+    except (requests.RequestException, ValueError) as e:
+        return _text_result(
+            _dumps(
+                {
+                    "error": f"Failed to enable whois privacy: {str(e)}",
+                },
+            )
+        )
 
-    elif name == "get_domain_nameservers":
-        domain_name = arguments["domain_name"]
 
-        response = requests.get(
-            f"{DNSIMPLE_API_BASE}/{account_id}/registrar/domains/{domain_name}/delegation",
-            headers=headers,
+# Tool handlers keyed by tool name
+_HANDLERS: Dict[str, Callable[[str, Dict[str, Any]], List[TextContent]]] = {
+    "get_domain_costs": _handle_get_domain_costs,
+    "get_renewal_costs": _handle_get_renewal_costs,
+    "configure_dns_record": _handle_configure_dns_record,
+    "list_dns_records": _handle_list_dns_records,
+    "delete_dns_record": _handle_delete_dns_record,
+    "disable_autorenew": _handle_disable_autorenew,
+    "transfer_domain": _handle_transfer_domain,
+    "list_domains": _handle_list_domains,
+    "get_domain_nameservers": _handle_get_domain_nameservers,
+    "update_domain_nameservers": _handle_update_domain_nameservers,
+    "get_whois_privacy": _handle_get_whois_privacy,
+    "enable_whois_privacy": _handle_enable_whois_privacy,
+}
+
+
+@app.call_tool(validate_input=False)
+async def call_tool(
+    name: str, arguments: Dict[str, Any]
+) -> Union[List[TextContent], CallToolResult]:
+    """Handle tool calls."""
+    # API calls are blocking, so run them off the event loop to keep the
+    # server responsive to other requests while a tool call is in flight
+    return await asyncio.to_thread(_call_tool, name, arguments)
+
+
+def _call_tool(
+    name: str, arguments: Dict[str, Any]
+) -> Union[List[TextContent], CallToolResult]:
+    """Run a tool call synchronously."""
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return _text_result(_UNKNOWN_TOOL_TEMPLATE % _dumps(name)[1:-1])
+
+    # Validation against the precompiled schemas replaces the MCP server's
+    # per-call jsonschema.validate, which rebuilds the validator every time.
+    # Failures are flagged as errors, as the server's own check does; the
+    # decorator passes a CallToolResult through unchanged from mcp 1.19 on.
+    try:
+        _VALIDATORS[name].validate(arguments)
+    except jsonschema.ValidationError as e:
+        return CallToolResult(
+            content=[
+                TextContent(type="text", text=f"Input validation error: {e.message}")
+            ],
+            isError=True,
         )
 
-        if response.status_code == 200:
-            raw_data = response.json().get("data")
-            if isinstance(raw_data, list):
-                nameservers_list = raw_data
-                payload = {"name_servers": raw_data}
-            elif isinstance(raw_data, dict):
-                nameservers_list = raw_data.get("name_servers", [])
-                payload = raw_data
-            else:
-                nameservers_list = []
-                payload = {"name_servers": []}
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "domain": domain_name,
-                            "nameservers": nameservers_list,
-                            "delegation": payload,
-                        },
-                        indent=2,
-                        default=str,
-                    ),
-                )
-            ]
-        else:
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "error": f"Failed to get domain nameservers: {response.status_code}",
-                            "response": response.text,
-                        },
-                        indent=2,
-                    ),
-                )
-            ]
-
-    elif name == "update_domain_nameservers":
-        domain_name = arguments["domain_name"]
-        nameservers = arguments.get("nameservers", [])
-        normalized_nameservers = [
-            str(ns).strip().rstrip(".").lower()
-            for ns in nameservers
-            if str(ns).strip()
-        ]
-
-        if len(normalized_nameservers) < 2:
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "error": "At least two nameservers are required.",
-                        },
-                        indent=2,
-                    ),
-                )
-            ]
+    api_token = get_dnsimple_token()
+
+    if not api_token:
+        return _text_result(_TOKEN_NOT_FOUND_TEXT)
+
+    _authenticate_session(api_token)
 
-        response = requests.put(
-            f"{DNSIMPLE_API_BASE}/{account_id}/registrar/domains/{domain_name}/delegation",
-            headers={**headers, "Content-Type": "application/json"},
-            json=normalized_nameservers,
+    try:
+        account_id = get_account_id(api_token)
+    except Exception as e:
+        return _text_result(
+            _dumps(
+                {
+                    "error": f"Failed to get account ID: {str(e)}",
+                },
+            )
         )
 
-        if response.status_code == 200:
-            raw_data = response.json().get("data")
-            if isinstance(raw_data, list):
-                nameservers_list = raw_data
-                payload = {"name_servers": raw_data}
-            elif isinstance(raw_data, dict):
-                nameservers_list = raw_data.get("name_servers", normalized_nameservers)
-                payload = raw_data
-            else:
-                nameservers_list = normalized_nameservers
-                payload = {"name_servers": normalized_nameservers}
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "success": True,
-                            "domain": domain_name,
-                            "nameservers": nameservers_list,
-                            "delegation": payload,
-                        },
-                        indent=2,
-                        default=str,
-                    ),
-                )
-            ]
-        else:
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "error": f"Failed to update nameservers: {response.status_code}",
-                            "response": response.text,
-                        },
-                        indent=2,
-                    ),
-                )
-            ]
+    return handler(account_id, arguments)
 
-    elif name == "get_whois_privacy":
-        domain_name = arguments["domain_name"]
 
-        try:
-            response = requests.get(
-                f"{DNSIMPLE_API_BASE}/{account_id}/registrar/domains/{domain_name}/whois_privacy",
-                headers=headers,
-            )
+class _PipeLineReader:
+    """Async line iterator over an asyncio stream, as stdio_server expects."""
+
+    def __init__(self, reader: asyncio.StreamReader):
+        self._reader = reader
+
+    def __aiter__(self) -> "_PipeLineReader":
+        return self
+
+    async def __anext__(self) -> str:
+        chunks = []
+        while True:
+            try:
+                chunks.append(await self._reader.readuntil(b"\n"))
+                break
+            except asyncio.IncompleteReadError as e:
+                # End of input; keep a final line without a newline
+                chunks.append(e.partial)
+                break
+            except asyncio.LimitOverrunError as e:
+                # Line is longer than the buffer; take what is buffered
+                chunks.append(await self._reader.read(e.consumed))
+        line = b"".join(chunks)
+        if not line:
+            raise StopAsyncIteration
+        return line.decode("utf-8", "replace")
+
+
+class _PipeTextWriter:
+    """Async text writer over an asyncio stream, as stdio_server expects."""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self._writer = writer
+
+    async def write(self, data: str) -> None:
+        self._writer.write(data.encode("utf-8"))
+
+    async def flush(self) -> None:
+        await self._writer.drain()
 
-            if response.status_code == 200:
-                whois_data = response.json().get("data", {})
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            {
-                                "domain": domain_name,
-                                "whois_privacy": whois_data,
-                                "enabled": whois_data.get("enabled", False),
-                                "expires_on": whois_data.get("expires_on"),
-                            },
-                            indent=2,
-                            default=str,
-                        ),
-                    )
-                ]
-            elif response.status_code == 404:
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            {
-                                "domain": domain_name,
-                                "enabled": False,
-                                "message": "Whois privacy not purchased or not available for this domain",
-                            },
-                            indent=2,
-                        ),
-                    )
-                ]
-            else:
-                error_text = response.text
-                try:
-                    error_json = response.json()
-                    error_message = error_json.get("message", error_text)
-                except:
-                    error_message = error_text
-
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            {
-                                "error": f"Failed to get whois privacy status: {response.status_code}",
-                                "message": error_message,
-                            },
-                            indent=2,
-                        ),
-                    )
-                ]
-        except Exception as e:
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "error": f"Failed to get whois privacy: {str(e)}",
-                        },
-                        indent=2,
-                    ),
-                )
-            ]
 
-    elif name == "enable_whois_privacy":
-        domain_name = arguments["domain_name"]
+def _is_pipe(stream: Any) -> bool:
+    """Check whether a standard stream is a pipe or socket.
 
+    Attaching a stream to the event loop sets O_NONBLOCK on its shared file
+    description and never clears it, so TTYs and other devices are left alone
+    to avoid leaving the user's terminal non-blocking after the server exits.
+    """
+    try:
+        mode = os.fstat(stream.fileno()).st_mode
+    except (OSError, ValueError, AttributeError):
+        return False
+    return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode)
+
+
+async def _connect_stdio() -> (
+    Tuple[Optional[_PipeLineReader], Optional[_PipeTextWriter]]
+):
+    """Attach stdin/stdout to the event loop as non-blocking pipes.
+
+    stdio_server otherwise reads stdin through a worker thread per line.
+    Either side is None if it is not a pipe or socket or cannot be attached,
+    in which case stdio_server falls back to its default for that side.
+    Windows always uses the default.
+    """
+    if sys.platform == "win32":
+        return None, None
+
+    loop = asyncio.get_running_loop()
+
+    stdin = None
+    if _is_pipe(sys.stdin):
         try:
-            # First check current status
-            response = requests.get(
-                f"{DNSIMPLE_API_BASE}/{account_id}/registrar/domains/{domain_name}/whois_privacy",
-                headers=headers,
+            reader = asyncio.StreamReader(limit=STDIO_LINE_LIMIT)
+            await loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
             )
+            stdin = _PipeLineReader(reader)
+        except (OSError, ValueError, NotImplementedError):
+            pass
 
-            if response.status_code == 200:
-                whois_data = response.json().get("data", {})
-                if whois_data.get("enabled", False):
-                    return [
-                        TextContent(
-                            type="text",
-                            text=json.dumps(
-                                {
-                                    "domain": domain_name,
-                                    "status": "already_enabled",
-                                    "message": "Whois privacy is already enabled for this domain",
-                                    "whois_privacy": whois_data,
-                                },
-                                indent=2,
-                                default=str,
-                            ),
-                        )
-                    ]
-
-            # Enable/purchase whois privacy
-            response = requests.put(
-                f"{DNSIMPLE_API_BASE}/{account_id}/registrar/domains/{domain_name}/whois_privacy",
-                headers={**headers, "Content-Type": "application/json"},
+    stdout = None
+    if _is_pipe(sys.stdout):
+        try:
+            transport, protocol = await loop.connect_write_pipe(
+                asyncio.streams.FlowControlMixin, sys.stdout
             )
-
-            if response.status_code in [200, 201]:
-                whois_data = response.json().get("data", {})
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            {
-                                "success": True,
-                                "domain": domain_name,
-                                "status": "enabled",
-                                "message": "Whois privacy has been enabled for this domain",
-                                "whois_privacy": whois_data,
-                            },
-                            indent=2,
-                            default=str,
-                        ),
-                    )
-                ]
-            else:
-                error_text = response.text
-                try:
-                    error_json = response.json()
-                    error_message = error_json.get("message", error_text)
-                except:
-                    error_message = error_text
-
-                return [
-                    TextContent(
-                        type="text",
-                        text=json.dumps(
-                            {
-                                "error": f"Failed to enable whois privacy: {response.status_code}",
-                                "message": error_message,
-                            },
-                            indent=2,
-                        ),
-                    )
-                ]
-        except Exception as e:
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "error": f"Failed to enable whois privacy: {str(e)}",
-                        },
-                        indent=2,
-                    ),
-                )
-            ]
-
-    else:
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps(
-                    {
-                        "error": f"Unknown tool: {name}",
-                    },
-                    indent=2,
-                ),
+            stdout = _PipeTextWriter(
+                asyncio.StreamWriter(transport, protocol, None, loop)
             )
-        ]
+        except (OSError, ValueError, NotImplementedError):
+            pass
+
+    return stdin, stdout
 
 
 async def main():
     """Main entry point."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(read_stream, write_stream, app.create_initialization_options())
+    stdin, stdout = await _connect_stdio()
+    try:
+        async with stdio_server(stdin, stdout) as (read_stream, write_stream):
+            await app.run(
+                read_stream, write_stream, app.create_initialization_options()
+            )
+    finally:
+        SESSION.close()
 
 
 if __name__ == "__main__":
-    import asyncio
-
-    asyncio.run(main())
+    # Use uvloop's faster event loop where it is installed
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())